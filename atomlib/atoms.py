@@ -89,7 +89,10 @@ def _values_to_expr(df: t.Union[polars.DataFrame, HasAtoms], values: AtomValues,
     if isinstance(values, t.Mapping):
         return _get_symbol_mapping(df, values, ty)
     arr = numpy.asarray(values)
-    return polars.lit(polars.Series(arr, dtype=ty) if arr.size > 1 else arr[()])
+    if arr.size > 1:
+        return polars.lit(polars.Series(arr, dtype=ty))
+    # scalars are broadcast by polars, no need to materialize a full column
+    return polars.lit(arr[()], dtype=ty)
 
 
 def _values_to_numpy(df: t.Union[polars.DataFrame, HasAtoms], values: AtomValues, ty: t.Type[polars.DataType]) -> numpy.ndarray:
@@ -101,20 +104,45 @@ def _values_to_numpy(df: t.Union[polars.DataFrame, HasAtoms], values: AtomValues
         #    syms = df.select(polars.col('symbol').filter(values.is_null())).unique().to_series().to_list()
         #    raise ValueError(f"Could not remap symbols {', '.join(map(repr, syms))}") 
     if isinstance(values, polars.Series):
-        values = values.cast(ty)
-    return numpy.broadcast_to(values, len(df))
+        values = values.cast(ty).to_numpy()
+    arr = numpy.asarray(values)
+    # pass through arrays which are already the correct shape
+    if arr.shape == (len(df),):
+        return arr
+    return numpy.broadcast_to(arr, len(df))
 
 
-def _selection_to_expr(df: t.Union[polars.DataFrame, HasAtoms], selection: t.Optional[AtomSelection] = None) -> polars.Expr:
+def _selection_to_numpy(df: t.Union[polars.DataFrame, HasAtoms], selection: t.Optional[AtomSelection]) -> NDArray[numpy.bool_]:
     if selection is None:
-        return polars.lit(True, dtype=polars.Boolean)
-    return _values_to_expr(df, selection, ty=polars.Boolean)
+        return numpy.ones(len(df), dtype=numpy.bool_)
+    # cast to bool, so e.g. 0/1 selections are used as masks rather than indices
+    return numpy.asarray(_values_to_numpy(df, selection, polars.Boolean), dtype=numpy.bool_)
 
 
-def _selection_to_numpy(df: t.Union[polars.DataFrame, HasAtoms], selection: t.Optional[AtomSelection]) -> NDArray[numpy.bool_]:
-    if selection is None:
-        return numpy.full_like(len(df), 1, dtype=numpy.bool_)
-    return _values_to_numpy(df, selection, polars.Boolean)
+def _column_to_numpy(df: t.Union[polars.DataFrame, HasAtoms], col: str, selection: t.Optional[AtomSelection] = None) -> NDArray[numpy.float64]:
+    """
+    Return a writable `(N, 3)` float64 copy of vector column `col`, optionally filtered by `selection`.
+
+    Only `col` is copied; the rest of `df` is never filtered or materialized.
+    """
+    # zero-copy (read-only) view of the column
+    arr = df.get_column(col).to_numpy()
+    if selection is not None:
+        # fancy indexing makes a copy
+        return arr[_selection_to_numpy(df, selection)].astype(numpy.float64, copy=False)
+    return numpy.array(arr, dtype=numpy.float64)
+
+
+def _vec_series(name: str, arr: NDArray[numpy.floating]) -> polars.Series:
+    """Make a vector (`Array(Float64, 3)`) column `name` from the `(N, 3)` array `arr`."""
+    # https://github.com/pola-rs/polars/issues/18369
+    return polars.Series(name, arr if len(arr) else [], polars.Array(polars.Float64, 3))
+
+
+def _elem_mass(elem: polars.Series) -> polars.Series:
+    """Return the `'mass'` column (dtype `Float32`) for atomic numbers `elem`."""
+    # get_mass() performs a single gather over the element column
+    return get_mass(elem).cast(polars.Float32).alias('mass')
 
 
 def _select_schema(df: t.Union[polars.DataFrame, HasAtoms], schema: SchemaDict) -> polars.DataFrame:
@@ -528,6 +556,8 @@ class HasAtoms(abc.ABC):
     def assert_equal(self, other: t.Any):
         assert isinstance(other, HasAtoms)
         assert dict(self.schema) == dict(other.schema)
+        # cheap check before comparing column-by-column
+        assert len(self) == len(other), f"Length mismatch: {len(self)} != {len(other)}"
         for col in self.schema.keys():
             polars.testing.assert_series_equal(self[col], other[col], check_names=False, rtol=1e-3, atol=1e-8)
 
@@ -565,7 +595,8 @@ class HasAtoms(abc.ABC):
 
     def bbox_atoms(self) -> BBox3D:
         """Return the bounding box of all the atoms in ``self``."""
-        return BBox3D.from_pts(self.coords())
+        # read-only view, we don't need a copy here
+        return BBox3D.from_pts(self.get_column('coords').to_numpy())
 
     bbox = bbox_atoms
 
@@ -576,12 +607,25 @@ class HasAtoms(abc.ABC):
         If `selection` is given, only transform the atoms in `selection`.
         """
         transform = Transform3D.make(transform)
+
+        if selection is None:
+            # transform all atoms directly, without masking
+            columns = [_vec_series('coords', transform @ self.coords())]
+            if transform_velocities and (velocities := self.velocities()) is not None:
+                columns.append(_vec_series('velocity', transform.transform_vec(velocities)))
+            return self.with_columns(columns)
+
         selection = _selection_to_numpy(self, selection)
-        transformed = self.with_coords(Transform3D.make(transform) @ self.coords(selection), selection)
-        # try to transform velocities as well
-        if transform_velocities and (velocities := self.velocities(selection)) is not None:
-            return transformed.with_velocity(transform.transform_vec(velocities), selection)
-        return transformed
+        coords = self.coords()
+        coords[selection] = transform @ coords[selection]
+        columns = [_vec_series('coords', coords)]
+
+        # try to transform velocities as well (updating both columns in a single `with_columns`)
+        if transform_velocities and (velocities := self.velocities()) is not None:
+            velocities[selection] = transform.transform_vec(velocities[selection])
+            columns.append(_vec_series('velocity', velocities))
+
+        return self.with_columns(columns)
 
     transform = transform_atoms
 
@@ -624,28 +668,25 @@ class HasAtoms(abc.ABC):
         Floating point columns other than 'x', 'y', and 'z' will not by toleranced.
         """
         import scipy.spatial
+        import scipy.sparse
+        from scipy.sparse.csgraph import connected_components
 
         cols = set((subset,) if isinstance(subset, str) else subset)
 
-        indices = numpy.arange(len(self))
-
         spatial_cols = cols.intersection(('x', 'y', 'z'))
         cols -= spatial_cols
         if len(spatial_cols) > 0:
             coords = self.select([_coord_expr(col).alias(col) for col in spatial_cols]).to_numpy()
             tree = scipy.spatial.KDTree(coords)
 
-            # TODO This is a bad algorithm
-            while True:
-                changed = False
-                for (i, j) in tree.query_pairs(tol, 2.):
-                    # whenever we encounter a pair, ensure their index matches
-                    i_i, i_j = indices[[i, j]]
-                    if i_i != i_j:
-                        indices[i] = indices[j] = min(i_i, i_j)
-                        changed = True
-                if not changed:
-                    break
+            # atoms within `tol` of each other form a graph. Label each connected component
+            # (equivalent to a union-find over all close pairs)
+            pairs = tree.query_pairs(tol, 2., output_type='ndarray')
+            graph = scipy.sparse.coo_matrix(
+                (numpy.ones(len(pairs), dtype=numpy.bool_), (pairs[:, 0], pairs[:, 1])),
+                shape=(len(self), len(self))
+            )
+            _, indices = connected_components(graph, directed=False)
 
             self = self.with_column(polars.Series('_unique_pts', indices))
             cols.add('_unique_pts')
@@ -683,8 +724,7 @@ class HasAtoms(abc.ABC):
 
     def coords(self, selection: t.Optional[AtomSelection] = None, *, frame: t.Literal['local'] = 'local') -> NDArray[numpy.float64]:
         """Return a `(N, 3)` ndarray of atom coordinates (dtype [`numpy.float64`][numpy.float64])."""
-        df = self if selection is None else self.filter(_selection_to_expr(self, selection))
-        return df.get_column('coords').to_numpy().astype(numpy.float64)
+        return _column_to_numpy(self, 'coords', selection)
 
     def x(self) -> polars.Expr:
         return polars.col('coords').arr.get(0).alias('x')
@@ -700,8 +740,7 @@ class HasAtoms(abc.ABC):
         if 'velocity' not in self:
             return None
 
-        df = self if selection is None else self.filter(_selection_to_expr(self, selection))
-        return df.get_column('velocity').to_numpy().astype(numpy.float64)
+        return _column_to_numpy(self, 'velocity', selection)
 
     def types(self) -> t.Optional[polars.Series]:
         """
@@ -843,20 +882,27 @@ class HasAtoms(abc.ABC):
 
         stddev = self.select((polars.col('wobble') / 3.).sqrt()).to_series().to_numpy()
         coords = self.coords()
-        coords += stddev[:, None] * rng.standard_normal(coords.shape)
+        # scale and add the displacements in-place, to avoid (N, 3) temporaries
+        disp = rng.standard_normal(coords.shape)
+        disp *= stddev[:, None]
+        coords += disp
         return self.with_coords(coords)
 
     def apply_occupancy(self, rng: t.Union[numpy.random.Generator, int, None] = None) -> Self:
         """
         For each atom in `self`, use its `frac_occupancy` to randomly decide whether to remove it.
+
+        Output is reproducible for a given seed `rng`. Note that atoms are sampled with a single
+        uniform draw per atom, so seeded output differs from versions which used `rng.binomial`.
         """
         if 'frac_occupancy' not in self.columns:
             return self
         rng = numpy.random.default_rng(seed=rng)
 
         frac = self.select('frac_occupancy').to_series().to_numpy()
-        choice = rng.binomial(1, frac).astype(numpy.bool_)
-        return self.filter(polars.lit(choice))
+        # bernoulli trial, cheaper than rng.binomial(1, frac)
+        choice = rng.random(len(frac)) < frac
+        return self.filter(polars.Series(choice))
 
     def with_type(self, types: t.Optional[AtomValues] = None) -> Self:
         """
@@ -872,19 +918,15 @@ class HasAtoms(abc.ABC):
         if 'type' in self.columns:
             return self
 
-        unique = Atoms(self._get_frame().unique(maintain_order=False, subset=['elem', 'symbol']).sort(['elem', 'symbol']), _unchecked=True)
-        new = self.with_column(polars.Series('type', values=numpy.zeros(len(self)), dtype=polars.Int32))
+        # build a small (elem, symbol) -> type lookup table, and join it in one pass
+        lookup = self.select('elem', 'symbol').unique(maintain_order=False).sort(['elem', 'symbol']) \
+            .with_row_index('type', offset=1).with_columns(polars.col('type').cast(polars.Int32))
 
         logging.warning("Auto-assigning element types")
-        for (i, (elem, sym)) in enumerate(unique.select(('elem', 'symbol')).rows()):
-            print(f"Assigning type {i+1} to element '{sym}'")
-            new = new.with_column(polars.when((polars.col('elem') == elem) & (polars.col('symbol') == sym))
-                                        .then(polars.lit(i+1))
-                                        .otherwise(polars.col('type'))
-                                        .alias('type'))
+        types = self.select('elem', 'symbol').join(lookup, on=['elem', 'symbol'], how='left').get_column('type')
 
-        assert (new.get_column('type') == 0).sum() == 0
-        return new
+        assert types.null_count() == 0
+        return self.with_column(types)
 
     def with_mass(self, mass: t.Optional[ArrayLike] = None) -> Self:
         """
@@ -896,18 +938,11 @@ class HasAtoms(abc.ABC):
         if 'mass' in self.columns:
             return self
 
-        unique_elems = self.get_column('elem').unique()
-        new = self.with_column(polars.Series('mass', values=numpy.zeros(len(self)), dtype=polars.Float32))
-
         logging.warning("Auto-assigning element masses")
-        for elem in unique_elems:
-            new = new.with_column(polars.when(polars.col('elem') == elem)
-                                        .then(polars.lit(get_mass(elem)))
-                                        .otherwise(polars.col('mass'))
-                                        .alias('mass'))
+        mass = _elem_mass(self.get_column('elem'))
 
-        assert (new.get_column('mass').abs() < 1e-10).sum() == 0
-        return new
+        assert (mass.abs() < 1e-10).sum() == 0
+        return self.with_column(mass)
 
     def with_symbol(self, symbols: ArrayLike, selection: t.Optional[AtomSelection] = None) -> Self:
         """
@@ -935,9 +970,7 @@ class HasAtoms(abc.ABC):
             new_pts[selection] = pts
             pts = new_pts
 
-        # https://github.com/pola-rs/polars/issues/18369
-        pts = numpy.broadcast_to(pts, (len(self), 3)) if len(self) else []
-        return self.with_columns(polars.Series('coords', pts, polars.Array(polars.Float64, 3)))
+        return self.with_columns(_vec_series('coords', numpy.broadcast_to(pts, (len(self), 3))))
 
     def with_velocity(self, pts: t.Optional[ArrayLike] = None,
                       selection: t.Optional[AtomSelection] = None) -> Self:
@@ -949,20 +982,19 @@ class HasAtoms(abc.ABC):
             if 'velocity' in self:
                 return self
             all_pts = numpy.zeros((len(self), 3))
+        elif selection is None:
+            all_pts = pts
         else:
-            all_pts = self['velocity'].to_numpy()
-
-        if selection is None:
-            all_pts = pts or all_pts
-        elif pts is not None:
+            # convert selection to a mask once, and only overwrite the selected rows
             selection = _selection_to_numpy(self, selection)
-            all_pts = numpy.require(all_pts, requirements=['WRITEABLE'])
+            all_pts = self.velocities()
+            if all_pts is None:
+                all_pts = numpy.zeros((len(self), 3))
             pts = numpy.atleast_2d(pts)
             assert pts.shape[-1] == 3
             all_pts[selection] = pts
 
-        all_pts = numpy.broadcast_to(all_pts, (len(self), 3))
-        return self.with_columns(polars.Series('velocity', all_pts, polars.Array(polars.Float64, 3)))
+        return self.with_columns(_vec_series('velocity', numpy.broadcast_to(all_pts, (len(self), 3))))
 
 
 class Atoms(AtomsIOMixin, HasAtoms):
@@ -1027,11 +1059,14 @@ class Atoms(AtomsIOMixin, HasAtoms):
                     get_elem(self.inner['symbol']),
                 )
 
-            # cast to standard dtypes
-            self.inner = self.inner.with_columns([
+            # cast to standard dtypes (skipping columns which are already correct)
+            schema = self.inner.schema
+            casts = [
                 self.inner[col].cast(dtype)
-                for (col, dtype) in _COLUMN_DTYPES.items() if col in self.inner
-            ])
+                for (col, dtype) in _COLUMN_DTYPES.items() if col in schema and schema[col] != dtype
+            ]
+            if len(casts):
+                self.inner = self.inner.with_columns(casts)
 
             self._validate_atoms()
 
@@ -1064,7 +1099,7 @@ class Atoms(AtomsIOMixin, HasAtoms):
     def bbox(self) -> BBox3D:
         """Return the bounding box of all the points in `self`."""
         if self._bbox is None:
-            self._bbox = BBox3D.from_pts(self.coords())
+            self._bbox = BBox3D.from_pts(self.get_column('coords').to_numpy())
 
         return self._bbox
 
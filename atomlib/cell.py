@@ -176,7 +176,8 @@ class HasCell:
 
     def bbox_cell(self, frame: CoordinateFrame = 'local') -> BBox3D:
         """Return the bounding box of the cell box in the given coordinate system."""
-        return BBox3D.from_pts(self.corners(frame))
+        # use the transform's interval arithmetic rather than transforming all 8 corners
+        return self.get_transform(frame, 'cell_box') @ BBox3D.unit()
 
     bbox = bbox_cell
 
@@ -480,35 +481,40 @@ def cell_to_ortho(cell_size: VecLike, cell_angle: t.Optional[VecLike] = None) ->
     (a, b, c) = _validate_cell_size(cell_size)
     cell_angle = _validate_cell_angle(cell_angle)
 
-    if numpy.allclose(cell_angle.view(numpy.ndarray), numpy.pi/2.):
-        return LinearTransform3D.scale(a, b, c)
+    # same tolerance as numpy.allclose(cell_angle, pi/2), without the general broadcasting machinery
+    if (numpy.abs(cell_angle.view(numpy.ndarray) - numpy.pi/2.) <= 1e-8 + 1e-5 * numpy.pi/2.).all():
+        # orthogonal cell, construct the diagonal directly
+        return LinearTransform3D(numpy.diag([a, b, c]).astype(float))
 
-    (alpha, beta, gamma) = cell_angle
-    alphastar = numpy.cos(beta) * numpy.cos(gamma) - numpy.cos(alpha)
-    alphastar /= numpy.sin(beta) * numpy.sin(gamma)
-    alphastar = numpy.arccos(alphastar)
-    assert not numpy.isnan(alphastar)
+    # evaluate trig functions once, in a single vectorized call each
+    (cos_alpha, cos_beta, cos_gamma) = numpy.cos(cell_angle.view(numpy.ndarray))
+    (_, sin_beta, sin_gamma) = numpy.sin(cell_angle.view(numpy.ndarray))
+
+    cos_alphastar = (cos_beta * cos_gamma - cos_alpha) / (sin_beta * sin_gamma)
+    # alphastar is in [0, pi], so we don't need arccos: sin(arccos(x)) = sqrt(1 - x^2)
+    with numpy.errstate(invalid='ignore'):
+        sin_alphastar = numpy.sqrt(1. - cos_alphastar**2)
+    assert not numpy.isnan(sin_alphastar)
 
     # aligns a axis along x
     # aligns b axis in the x-y plane
-    return LinearTransform3D(numpy.array([
-        [a,  b * numpy.cos(gamma),  c * numpy.cos(beta)],
-        [0.,  b * numpy.sin(gamma), -c * numpy.sin(beta) * numpy.cos(alphastar)],
-        [0.,  0.,                     c * numpy.sin(beta) * numpy.sin(alphastar)],
-    ], dtype=float)).round_near_zero()
+    m = numpy.zeros((3, 3), dtype=float)
+    m[0] = (a, b * cos_gamma, c * cos_beta)
+    m[1, 1:] = (b * sin_gamma, -c * sin_beta * cos_alphastar)
+    m[2, 2] = c * sin_beta * sin_alphastar
+    return LinearTransform3D(m).round_near_zero()
 
 
 def ortho_to_cell(ortho: LinearTransform3D) -> t.Tuple[Vec3, Vec3]:
     """Get unit cell parameters `(cell_size, cell_angle)` from orthogonalization transform."""
     # TODO suspect
-    cell_size = numpy.linalg.norm(ortho.inner, axis=-2)
+    inner = ortho.inner
+    # column norms & dot products, without dispatching to linalg/BLAS for a 3x3 matrix
+    cell_size = numpy.sqrt(numpy.einsum('ij,ij->j', inner, inner))
     cell_size = _validate_cell_size(cell_size)
-    normed = ortho.inner / cell_size
-    cosines = numpy.array([
-        numpy.dot(normed[..., 1], normed[..., 2]), # alpha
-        numpy.dot(normed[..., 2], normed[..., 0]), # beta
-        numpy.dot(normed[..., 0], normed[..., 1]), # gamma
-    ])
+    normed = inner / cell_size
+    # (b.c, c.a, a.b) -> (alpha, beta, gamma)
+    cosines = numpy.einsum('ij,ij->j', normed[:, [1, 2, 0]], normed[:, [2, 0, 1]])
     cell_angle = numpy.arccos(cosines)
     cell_angle = _validate_cell_angle(cell_angle)
 
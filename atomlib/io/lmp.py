@@ -13,6 +13,7 @@ import numpy
 import polars
 
 from ..atomcell import HasAtomCell, HasAtoms, Atoms, Cell, AtomCell
+from ..atoms import _elem_mass
 from ..elem import get_elem, get_sym
 from ..util import open_file, FileOrPath, localtime, checked_left_join, CheckedJoinError
 from ..transform import AffineTransform3D, LinearTransform3D
@@ -159,8 +160,11 @@ class LMP:
 
             frame = atoms.get_atoms('local').with_type()
 
-        types = frame.unique(subset='type')
-        types = types.with_mass().sort('type')
+        # only carry the per-type columns through unique(), and compute masses on the deduplicated types
+        types = frame.select(polars.col('type', 'elem', 'symbol'), polars.col('^mass$')) \
+            .unique(subset='type').sort('type')
+        if 'mass' not in types:
+            types = types.with_columns(_elem_mass(types['elem']))
 
         now = localtime()
         comment = f"# Generated by atomlib on {now.isoformat(' ', 'seconds')}"
@@ -176,31 +180,25 @@ class LMP:
 
         headers['xy xz yz'] = (ortho[0, 1], ortho[0, 2], ortho[1, 2])
 
-        body = [
-            f" {ty:8} {sym:>4}\n"
-            for (ty, sym) in types.select('type', 'symbol').rows()
-        ]
-        sections.append(LMPSection("Atom Type Labels", tuple(body)))
+        type_col = types.get_column('type').to_numpy()
+        sym_col = types.get_column('symbol').to_list()
+
+        body = _format_rows(" %8d %4s\n", type_col, sym_col)
+        sections.append(LMPSection("Atom Type Labels", body))
 
         if 'mass' in types:
-            body = [
-                f" {ty:8} {mass:14.7f}  # {sym}\n"
-                for (ty, sym, mass) in types.select(('type', 'symbol', 'mass')).rows()
-            ]
-            sections.append(LMPSection("Masses", tuple(body)))
-
-        body = [
-            f" {i+1:8} {ty:4} {x:14.7f} {y:14.7f} {z:14.7f}\n"
-            for (i, (ty, (x, y, z))) in enumerate(frame.select(('type', 'coords')).rows())
-        ]
-        sections.append(LMPSection("Atoms", tuple(body), 'atomic'))
+            body = _format_rows(" %8d %14.7f  # %s\n", type_col, types.get_column('mass').to_numpy(), sym_col)
+            sections.append(LMPSection("Masses", body))
+
+        body = _format_rows(
+            " %8d %4d %14.7f %14.7f %14.7f\n",
+            range(1, len(frame) + 1), frame.get_column('type').to_numpy(), *frame.coords().T
+        )
+        sections.append(LMPSection("Atoms", body, 'atomic'))
 
         if (velocities := frame.velocities()) is not None:
-            body = [
-                f" {i+1:8} {v_x:14.7f} {v_y:14.7f} {v_z:14.7f}\n"
-                for (i, (v_x, v_y, v_z)) in enumerate(velocities)
-            ]
-            sections.append(LMPSection("Velocities", tuple(body)))
+            body = _format_rows(" %8d %14.7f %14.7f %14.7f\n", range(1, len(velocities) + 1), *velocities.T)
+            sections.append(LMPSection("Velocities", body))
 
         return LMP(comment, headers, tuple(sections))
 
@@ -210,22 +208,24 @@ class LMP:
             return LMPReader(f).parse()
 
     def write(self, file: FileOrPath):
-        with open_file(file, 'w') as f:
-            print((self.comment or "") + '\n', file=f)
+        # accumulate all lines, and then write them in one call
+        lines: t.List[str] = [(self.comment or "") + '\n\n']
 
-            # print headers
-            for (name, val) in self.headers.items():
-                val = _HEADER_FMT.get(name, lambda s: f"{s:8}")(val)
-                print(f" {val} {name}", file=f)
+        # headers
+        for (name, val) in self.headers.items():
+            val = _HEADER_FMT.get(name, lambda s: f"{s:8}")(val)
+            lines.append(f" {val} {name}\n")
 
-            # print sections
-            for section in self.sections:
-                line = section.name
-                if section.style is not None:
-                    line += f'  # {section.style}'
-                print(f"\n{line}\n", file=f)
+        # sections
+        for section in self.sections:
+            line = section.name
+            if section.style is not None:
+                line += f'  # {section.style}'
+            lines.append(f"\n{line}\n\n")
+            lines.extend(section.body)
 
-                f.writelines(section.body)
+        with open_file(file, 'w') as f:
+            f.write("".join(lines))
 
 
 @dataclass
@@ -380,6 +380,18 @@ def write_lmp(atoms: HasAtoms, f: FileOrPath):
     return
 
 
+def _format_rows(fmt: str, *cols: t.Union[numpy.ndarray, t.Iterable[t.Any]]) -> t.Tuple[str, ...]:
+    """
+    Format columns of values into lines using the printf-style format `fmt`.
+
+    Columns are converted to lists up front, which is much faster than iterating over
+    polars rows or numpy scalars. (`numpy.savetxt` is no help here, it formats row-by-row in Python).
+    """
+    return tuple(map(fmt.__mod__, zip(*(
+        col.tolist() if isinstance(col, numpy.ndarray) else col for col in cols
+    ))))
+
+
 def _parse_seq(f: t.Callable[[str], t.Any], n: int) -> t.Callable[[str], t.Tuple[t.Any, ...]]:
     def inner(s: str) -> t.Tuple[t.Any, ...]:
         vals = s.strip().split()
@@ -7,6 +7,7 @@ import polars
 from polars.testing import assert_frame_equal
 
 from .atoms import Atoms, _with_columns_stacked
+from .transform import AffineTransform3D
 
 
 def test_with_columns_stacked():
@@ -283,6 +284,11 @@ def test_wobble():
     assert new.select('wobble').to_numpy() == pytest.approx([0., 0., 0., 0.])
     assert new.with_wobble() is new
 
+    # scalars are cast to the column dtype
+    new = frame.with_wobble(1)
+    assert new.schema['wobble'] == polars.Float64
+    assert new.select('wobble').to_numpy() == pytest.approx([1., 1., 1., 1.])
+
 
 def test_occupancy():
     frame = Atoms({
@@ -297,3 +303,93 @@ def test_occupancy():
     assert 'frac_occupancy' in new
     assert new.select('frac_occupancy').to_numpy() == pytest.approx([1., 1., 1., 1.])
     assert new.with_occupancy() is new
+
+
+def test_deduplicate():
+    frame = Atoms({
+        'x': [0., 5e-4, 1e-3, 5., 5.],
+        'y': [0., 0., 0., 0., 0.],
+        'z': [0., 0., 0., 0., 0.],
+        'elem': [1, 1, 1, 1, 2],
+    })
+
+    # chains of nearby atoms should be collapsed to the first atom
+    new = frame.deduplicate(tol=6e-4)
+    new.assert_equal(Atoms({
+        'x': [0., 5., 5.],
+        'y': [0., 0., 0.],
+        'z': [0., 0., 0.],
+        'elem': [1, 1, 2],
+    }))
+
+    assert len(Atoms.empty().deduplicate()) == 0
+
+
+def test_velocity():
+    frame = Atoms({
+        'x': [0., 1., 2.],
+        'y': [0., 0., 0.],
+        'z': [0., 0., 0.],
+        'elem': [1, 1, 2],
+    })
+
+    new = frame.with_velocity()
+    assert frame.velocities() is None
+    assert_array_equal(new.velocities(), numpy.zeros((3, 3)))
+    assert new.with_velocity() is new
+
+    new = frame.with_velocity(numpy.ones((3, 3)))
+    assert_array_equal(new.velocities(), numpy.ones((3, 3)))
+
+    new = new.with_velocity([2., 3., 4.], polars.col('elem') == 2)
+    assert_array_equal(new.velocities(), [[1., 1., 1.], [1., 1., 1.], [2., 3., 4.]])
+
+    # selection on atoms without existing velocities
+    new = frame.with_velocity([2., 3., 4.], [True, False, False])
+    assert_array_equal(new.velocities(), [[2., 3., 4.], [0., 0., 0.], [0., 0., 0.]])
+
+    # 0/1 selections are masks, not indices
+    assert_array_equal(frame.coords([1, 0, 1]), [[0., 0., 0.], [2., 0., 0.]])
+    assert_array_equal(new.velocities([1, 0, 1]), [[2., 3., 4.], [0., 0., 0.]])
+
+
+def test_transform_atoms_selection():
+    frame = Atoms({
+        'x': [0., 1., 2.],
+        'y': [0., 0., 0.],
+        'z': [0., 0., 0.],
+        'elem': [1, 1, 2],
+    }).with_velocity(numpy.ones((3, 3)))
+
+    transform = AffineTransform3D.translate(0., 1., 0.).scale(2., 2., 2.)
+    new = frame.transform_atoms(transform, [1, 0, 1], transform_velocities=True)
+    assert_array_equal(new.coords(), [[0., 2., 0.], [1., 0., 0.], [4., 2., 0.]])
+    assert_array_equal(new.velocities(), [[2., 2., 2.], [1., 1., 1.], [2., 2., 2.]])
+
+
+def test_apply_occupancy():
+    frame = Atoms({
+        'x': [0., 1., 2., 3.],
+        'y': [0., 0., 0., 0.],
+        'z': [0., 0., 0., 0.],
+        'elem': [22, 78, 22, 1],
+        'frac_occupancy': [1., 0., 1., 0.],
+    })
+
+    new = frame.apply_occupancy(rng=5)
+    assert_array_equal(new.coords(), [[0., 0., 0.], [2., 0., 0.]])
+
+    n = 10000
+    frame = Atoms({
+        'x': numpy.arange(n, dtype=numpy.float64),
+        'y': numpy.zeros(n),
+        'z': numpy.zeros(n),
+        'elem': numpy.full(n, 22),
+        'frac_occupancy': numpy.full(n, 0.5),
+    })
+
+    new = frame.apply_occupancy(rng=5)
+    # binomial with sigma = 50
+    assert 4800 < len(new) < 5200
+    # seeded output is reproducible
+    assert_array_equal(new.coords(), frame.apply_occupancy(rng=5).coords())
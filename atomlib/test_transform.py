@@ -1,10 +1,12 @@
 import typing as t
 
 import numpy
+import polars
 import pytest
 from numpy.testing import assert_allclose
 
-from .transform import LinearTransform3D, AffineTransform3D
+from .transform import Transform3D, LinearTransform3D, AffineTransform3D, FuncTransform3D
+from .bbox import BBox3D
 
 
 def test_linear_transform_constructors():
@@ -68,6 +70,87 @@ def test_affine_transform_compose():
     assert_allclose((t.inverse() @ t).inner, numpy.eye(4))
 
 
+def test_transform_chain():
+    translate = AffineTransform3D.translate(1., 2., 3.)
+    rotate = LinearTransform3D.rotate([1., 0., 0.], 0.3)
+    scale = LinearTransform3D.scale(1., 2., 3.)
+
+    chained = Transform3D.chain(translate, rotate, scale, translate, rotate)
+    assert isinstance(chained, AffineTransform3D)
+    assert_allclose(chained.inner, translate.compose(rotate).compose(scale).compose(translate).compose(rotate).inner)
+
+    chained = Transform3D.chain(rotate, scale)
+    assert isinstance(chained, LinearTransform3D)
+    assert_allclose(chained.inner, (scale @ rotate).inner)
+
+    pts = numpy.array([[0., 0., 0.], [1., 0., 0.], [0., 1., 2.]])
+    func = FuncTransform3D(lambda pts: 2. * pts)
+    assert_allclose(Transform3D.chain(translate, func, rotate) @ pts, rotate @ (2. * (translate @ pts)))
+
+    assert_allclose(Transform3D.chain().inner, numpy.eye(3))
+
+
+def test_transform_transpose():
+    t = LinearTransform3D.rotate([1., 1., 0.], 0.4).scale(1., 2., 3.)
+    assert_allclose(t.T.inner, t.inner.T)
+    assert t.T.inner.flags.c_contiguous
+    assert t.T is t.T
+    assert_allclose(t.T.T.inner, t.inner)
+
+
+@pytest.mark.parametrize('transform', (LinearTransform3D(dtype=numpy.float32), AffineTransform3D(dtype=numpy.float32)))
+def test_transform_dtype(transform: AffineTransform3D):
+    t = transform.translate(1., 2., 3.).rotate([1., 1., 0.], 0.3).rotate_euler(0.1, 0.2, 0.3) \
+        .scale(1., 2., 3.).mirror([0., 1., 1.]).strain(0.1, [1., 0., 0.], poisson=0.3)
+    assert t.inner.dtype == numpy.float32
+    assert t.inverse().inner.dtype == numpy.float32
+
+    pts = numpy.array([[0., 0., 0.], [1., 2., 3.]])
+    assert (t @ pts).dtype == numpy.float32
+    assert (t @ pts[1]).dtype == numpy.float32
+    assert t.astype(numpy.float64).inner.dtype == numpy.float64
+
+    # composition keeps the dtype of the transformation applied first, for every combination
+    for other in (LinearTransform3D.rotate([0., 0., 1.], 0.2), AffineTransform3D.translate(1., 0., 0.)):
+        assert t.compose(other).inner.dtype == numpy.float32
+        assert (other @ t).inner.dtype == numpy.float32
+        assert other.compose(t).inner.dtype == numpy.float64
+        assert Transform3D.chain(t, other).inner.dtype == numpy.float32
+        assert Transform3D.chain(other, t).inner.dtype == numpy.float64
+
+    with pytest.raises(TypeError, match="must be floating point"):
+        LinearTransform3D(dtype=numpy.int64)
+
+
+def test_transform_sized_args():
+    # sized types other than list/tuple/ndarray should still be treated as vectors
+    v = polars.Series([1., 2., 3.])
+    assert_allclose(LinearTransform3D.scale(v).inner, numpy.diag([1., 2., 3.]))
+    assert_allclose(AffineTransform3D.translate(v).translation(), [1., 2., 3.])
+    assert_allclose(LinearTransform3D.mirror(polars.Series([1., 0., 0.])).inner, numpy.diag([-1., 1., 1.]))
+
+
+def test_transform_cuda():
+    cupy = pytest.importorskip('cupy')
+
+    pts = numpy.random.default_rng(0).random((100, 3))
+    for t in (
+        LinearTransform3D().rotate([1., 1., 0.], 0.3).scale(2., 2., 1.),
+        AffineTransform3D().translate(1., 2., -1.).rotate_euler(0.2, 0.3, 0.4),
+    ):
+        assert_allclose(t.transform_cuda(pts).get(), t.transform(pts))
+        assert_allclose(t.transform_cuda(cupy.asarray(pts)).get(), t.transform(pts))
+
+
+def test_transform_inverse():
+    t = AffineTransform3D.translate(1., 2., -3.).rotate([1., 1., 0.], 0.4).scale(1., 2., 3.)
+    assert_allclose(t.inverse().inner, numpy.linalg.inv(t.inner), atol=1e-12)
+    assert_allclose(t.to_linear().inverse().inner, numpy.linalg.inv(t.to_linear().inner), atol=1e-12)
+
+    with pytest.raises(numpy.linalg.LinAlgError):
+        LinearTransform3D.scale(1., 0., 1.).inverse()
+
+
 @pytest.mark.parametrize('transform', (LinearTransform3D, AffineTransform3D, LinearTransform3D(), AffineTransform3D()))
 def test_transform_ops(transform: t.Union[AffineTransform3D, t.Type[AffineTransform3D]]):
     # rotate
@@ -156,6 +239,58 @@ def test_transform_apply():
         assert pts @ t
 
 
+def test_transform_apply_single():
+    for t in (
+        LinearTransform3D().rotate([1., 1., 0.], 0.3).scale(2., 0., 1.),
+        AffineTransform3D().translate(1., 2., -1.).rotate_euler(0.2, 0.3, 0.4).scale(0., 1., 1.),
+    ):
+        for pt in ([1., 2., 3.], [numpy.inf, 0., 0.], [0., -numpy.inf, 1.], [numpy.nan, 0., 0.]):
+            pt = numpy.array(pt)
+            assert_allclose(t @ pt, (t @ pt[None])[0])
+
+
+def test_transform_apply_large():
+    from .transform import _BLOCK_ROWS
+    pts = numpy.random.default_rng(0).random((2 * _BLOCK_ROWS + 5, 3))
+    # inf * 0 in a later column only
+    pts[-1] = [numpy.inf, 0., 0.]
+
+    t = AffineTransform3D().translate(1., 0., 0.).scale(1., 0., 1.)
+    expected = pts * [1., 0., 1.] + [1., 0., 0.]
+    assert_allclose(t @ pts, expected)
+
+
+def test_transform_soa():
+    pts = numpy.array([
+        [0., 0., 0.], [1., 0., 0.], [0., 1., 0.], [1., 1., 2.],
+    ])
+
+    for t in (
+        LinearTransform3D().rotate([1., 1., 0.], 0.3).scale(2., 2., 1.),
+        AffineTransform3D().translate(1., 2., -1.).rotate_euler(0.2, 0.3, 0.4),
+        FuncTransform3D(lambda pts: 2. * pts),
+    ):
+        assert_allclose(t.transform_soa(pts.T), t.transform(pts).T)
+
+    with pytest.raises(ValueError, match="Expected points of shape"):
+        LinearTransform3D().transform_soa(pts)
+
+
+def test_transform_bbox():
+    bbox = BBox3D([0., -1., 2.], [1., 3., 5.])
+
+    for t in (
+        LinearTransform3D().rotate([0., 0., 1.], 1.).scale(2., -1., 1.),
+        AffineTransform3D().rotate([1., 2., 3.], 0.7).translate(1., 2., 3.),
+    ):
+        expected = BBox3D.from_pts(t.transform(bbox.corners()))
+        assert_allclose(t.transform(bbox).inner, expected.inner, atol=1e-12)
+
+    # infinite bounds shouldn't pollute other axes
+    bbox = BBox3D([-numpy.inf, 0., 0.], [numpy.inf, 1., 1.])
+    assert_allclose((LinearTransform3D().scale(2., 1., 1.) @ bbox).inner, [[-numpy.inf, numpy.inf], [0., 1.], [0., 1.]])
+
+
 def test_transform_compose():
     t1 = LinearTransform3D().scale(2., 1., 1.)
     t2 = LinearTransform3D().rotate([0., 0., 1.], numpy.pi/2)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from functools import cached_property
+import math
 import typing as t
 
-from typing_extensions import TypeAlias
+from typing_extensions import TypeAlias, TypeGuard
 import numpy
-from numpy.typing import ArrayLike, NDArray
+from numpy.typing import ArrayLike, DTypeLike, NDArray
 
 from .types import VecLike, Pts3DLike, Num, to_vec3
 from .vec import perp, reduce_vec, is_diagonal
@@ -26,6 +28,119 @@ functions (which should take a Nx3 ndarray and return an ndarray of the same sha
 """
 
 
+def _to_matrix(array: ArrayLike, n: int, dtype: t.Optional[DTypeLike] = None) -> NDArray[numpy.floating]:
+    """
+    Convert `array` into a read-only, C-contiguous `(n, n)` floating point matrix.
+    If `dtype` isn't specified, floating point inputs keep their dtype.
+
+    Unlike a broadcast view, this can be passed directly to BLAS.
+    """
+    arr = numpy.asarray(array)
+    if dtype is not None:
+        dtype = numpy.dtype(dtype)
+        if not numpy.issubdtype(dtype, numpy.floating):
+            raise TypeError(f"Transform dtype must be floating point, instead got '{dtype}'")
+    else:
+        dtype = arr.dtype if numpy.issubdtype(arr.dtype, numpy.floating) else numpy.float64
+    arr = numpy.array(numpy.broadcast_to(arr, (n, n)), dtype=dtype, order='C')
+    arr.flags.writeable = False
+    return arr
+
+
+_IDENTITY3 = _to_matrix(numpy.eye(3), 3)
+_IDENTITY4 = _to_matrix(numpy.eye(4), 4)
+
+_BLOCK_ROWS: int = 32768
+"""Row count of the blocks `_transform_pts` works on, sized so each block stays in cache."""
+
+
+def _transform_pts(pts: NDArray[numpy.floating], linear_t: NDArray[numpy.floating],
+                   translation: t.Optional[NDArray[numpy.floating]] = None) -> NDArray[numpy.floating]:
+    """
+    Apply the linear transformation with transpose `linear_t` (and then `translation`) to the `(..., 3)` array `pts`.
+
+    `pts @ linear_t` is the fastest form for row-major points, provided `linear_t` is C-contiguous
+    (a transposed view is up to ~4x slower for mid-sized inputs), so the transpose is passed in.
+    Large inputs are processed in cache-sized blocks, so the translation and nan check run on
+    data which is still in cache. inf/nan handling is only performed when the output contains nans.
+    """
+    out = numpy.empty(pts.shape, dtype=numpy.result_type(pts, linear_t))
+    with numpy.errstate(invalid='ignore'):
+        if pts.ndim == 2 and len(pts) > _BLOCK_ROWS:
+            has_nan = False
+            # scratch buffer for the nan check, reused between blocks
+            scratch = numpy.empty((_BLOCK_ROWS, 3), dtype=numpy.bool_)
+            for i in range(0, len(pts), _BLOCK_ROWS):
+                block = out[i:i + _BLOCK_ROWS]
+                numpy.matmul(pts[i:i + _BLOCK_ROWS], linear_t, out=block)
+                if translation is not None:
+                    block += translation
+                if not has_nan:
+                    has_nan = bool(numpy.isnan(block, out=scratch[:len(block)]).any())
+        else:
+            numpy.matmul(pts, linear_t, out=out)
+            if translation is not None:
+                out += translation
+            has_nan = bool(numpy.isnan(out).any())
+
+    if not has_nan:
+        return out
+
+    # nan output comes from either nan input or inf * 0
+    isinf = numpy.bitwise_or.reduce(numpy.isnan(out), axis=-1)
+
+    # carefully handle inf and nan
+    isinf &= ~numpy.bitwise_or.reduce(numpy.isnan(pts), axis=-1)
+
+    with numpy.errstate(invalid='ignore'):
+        prod = numpy.multiply(linear_t.T, pts[isinf, None, :])
+
+    # inf * 0 = 0
+    prod[numpy.isnan(prod)] = 0.
+    fixed = numpy.sum(prod, axis=-1)
+    if translation is not None:
+        fixed += translation
+    out[isinf] = fixed
+    return out
+
+
+def _inv3x3(m: NDArray[numpy.floating]) -> NDArray[numpy.floating]:
+    """
+    Invert the 3x3 matrix `m`, using the closed-form adjugate formula.
+
+    For a single 3x3 matrix, this is much cheaper than the setup cost of `numpy.linalg.inv`.
+    """
+    ((a, b, c), (d, e, f), (g, h, i)) = m.tolist()
+    # cofactors of the first row
+    (A, B, C) = (e*i - f*h, f*g - d*i, d*h - e*g)
+    det = a*A + b*B + c*C
+    if det == 0. or not math.isfinite(det):
+        raise numpy.linalg.LinAlgError("Singular matrix")
+    return numpy.array([
+        [A, c*h - b*i, b*f - c*e],
+        [B, a*i - c*g, c*d - a*f],
+        [C, b*g - a*h, a*e - b*d],
+    ], dtype=m.dtype) / det
+
+
+_SEQ_TYPES = (list, tuple, numpy.ndarray)
+"""Common vector argument types, checked before the (much slower) `typing.Sized` protocol check."""
+
+
+def _is_seq(x: object) -> TypeGuard[t.Union[t.Sequence[Num], NDArray[numpy.generic]]]:
+    """Return whether the transformation argument `x` is a vector rather than a scalar."""
+    if isinstance(x, _SEQ_TYPES):
+        return True
+    return not isinstance(x, (int, float)) and isinstance(x, t.Sized)
+
+
+def _soa_pts(points: ArrayLike, dtype: numpy.dtype) -> NDArray[numpy.floating]:
+    pts = numpy.asarray(points, dtype=dtype)
+    if pts.ndim != 2 or pts.shape[0] != 3:
+        raise ValueError(f"Expected points of shape (3, N), instead got shape {pts.shape}")
+    return pts
+
+
 class Transform3D(ABC):
     """
     Arbitrary 3D transformation. Superclass of all 3D transformation types.
@@ -58,6 +173,54 @@ class Transform3D(ABC):
             return AffineTransform3D(data)
         raise ValueError(f"Transform3D of invalid shape {data.shape}")
 
+    @staticmethod
+    def chain(*transforms: Transform3D) -> Transform3D:
+        """
+        Compose `transforms` in order, so the first transformation is applied first.
+
+        Equivalent to `transforms[0].compose(transforms[1]).compose(...)`, but consecutive
+        affine transformations are folded into a single matrix, without building
+        an intermediate transformation at each step. If all `transforms` are linear,
+        a [`LinearTransform3D`][atomlib.transform.LinearTransform3D] is returned.
+        Like `compose`, each folded run keeps the dtype of its first transformation.
+        """
+        result: t.Optional[Transform3D] = None
+        # accumulated matrix of the current run of affine transformations
+        acc: t.Optional[NDArray[numpy.floating]] = None
+        linear = True
+
+        for transform in transforms:
+            if not isinstance(transform, AffineTransform3D):
+                if acc is not None:
+                    run = (LinearTransform3D if linear else AffineTransform3D)._from_validated(acc)
+                    result = run if result is None else result.compose(run)
+                    acc = None
+                result = transform if result is None else result.compose(transform)
+                continue
+
+            inner = transform.inner
+            if isinstance(transform, LinearTransform3D):
+                if acc is None:
+                    (acc, linear) = (inner.copy(), True)
+                elif linear:
+                    acc = (inner @ acc).astype(acc.dtype, copy=False)
+                else:
+                    acc[:3] = inner @ acc[:3]
+            elif acc is None:
+                (acc, linear) = (inner.copy(), False)
+            elif linear:
+                a = inner.astype(acc.dtype)
+                a[:3, :3] = inner[:3, :3] @ acc
+                (acc, linear) = (a, False)
+            else:
+                acc = (inner @ acc).astype(acc.dtype, copy=False)
+
+        if acc is not None:
+            run = (LinearTransform3D if linear else AffineTransform3D)._from_validated(acc)
+            result = run if result is None else result.compose(run)
+
+        return LinearTransform3D() if result is None else result
+
     @abstractmethod
     def compose(self, other: Transform3D) -> Transform3D:
         """Compose this transformation with another."""
@@ -80,6 +243,13 @@ class Transform3D(ABC):
 
     __call__ = transform
 
+    def transform_soa(self, points: ArrayLike) -> NDArray[numpy.floating]:
+        """
+        Transform points stored in structure-of-arrays layout (shape `(3, N)`, i.e. `[[x...], [y...], [z...]]`),
+        returning points in the same layout.
+        """
+        return self.transform(numpy.asarray(points).T).T
+
     def transform_vec(self, vecs: ArrayLike) -> NDArray[numpy.floating]:
         """Transform vector quantities. This excludes translation, as would be expected when transforming vectors."""
         a = numpy.atleast_1d(vecs)
@@ -147,10 +317,19 @@ class FuncTransform3D(Transform3D):
 class AffineTransform3D(Transform3D):
     __array_ufunc__ = None
 
-    def __init__(self, array: t.Optional[ArrayLike] = None):
+    def __init__(self, array: t.Optional[ArrayLike] = None, dtype: t.Optional[DTypeLike] = None):
+        """
+        Create an affine transformation from a 4x4 matrix (default: identity).
+
+        `dtype` sets the floating point type of the matrix (e.g. `numpy.float32`, to halve
+        the memory traffic of `transform`). Transformations built from `self` keep its dtype,
+        and points are transformed at this precision.
+        """
         if array is None:
-            array = numpy.eye(4)
-        self.inner = numpy.broadcast_to(array, (4, 4))
+            # the default instance is built on every classmethod-style call, so share a read-only identity
+            self.inner = _IDENTITY4 if dtype is None else _to_matrix(_IDENTITY4, 4, dtype)
+        else:
+            self.inner = _to_matrix(array, 4, dtype)
 
     @property
     def __array_interface__(self):
@@ -159,25 +338,43 @@ class AffineTransform3D(Transform3D):
     def __repr__(self) -> str:
         return f"AffineTransform3D(\n{self.inner!r}\n)"
 
+    @classmethod
+    def _from_validated(cls: t.Type[Affine3DSelf], array: NDArray[numpy.floating]) -> Affine3DSelf:
+        """
+        Construct a transformation directly from `array`, skipping validation.
+
+        `array` must be a freshly created, C-contiguous floating point matrix
+        of the correct shape, which isn't referenced elsewhere.
+        """
+        self = cls.__new__(cls)
+        array.flags.writeable = False
+        self.inner = array
+        return self
+
     @staticmethod
     def identity() -> AffineTransform3D:
         """Return an identity transformation."""
         return AffineTransform3D()
 
+    def astype(self: Affine3DSelf, dtype: DTypeLike) -> Affine3DSelf:
+        """Return `self` with its matrix converted to the floating point type `dtype`."""
+        if self.inner.dtype == numpy.dtype(dtype):
+            return self
+        return type(self)(self.inner, dtype=dtype)
+
     def round_near_zero(self: Affine3DSelf) -> Affine3DSelf:
         """Round near-zero matrix elements in self."""
-        return type(self)(
+        return type(self)._from_validated(
             numpy.where(numpy.abs(self.inner) < 1e-15, 0., self.inner)
         )
 
     @staticmethod
     def from_linear(linear: LinearTransform3D) -> AffineTransform3D:
         """Make an affine transformation from a linear transformation."""
-        dtype = linear.inner.dtype
-        return AffineTransform3D(numpy.block([
-            [linear.inner, numpy.zeros((3, 1), dtype=dtype)],
-            [numpy.zeros((1, 3), dtype=dtype), numpy.ones((), dtype=dtype)]
-        ]))  # type: ignore
+        a = numpy.zeros((4, 4), dtype=linear.inner.dtype)
+        a[:3, :3] = linear.inner
+        a[3, 3] = 1.
+        return AffineTransform3D._from_validated(a)
 
     def to_linear(self) -> LinearTransform3D:
         """Return the linear part of an affine transformation."""
@@ -197,9 +394,14 @@ class AffineTransform3D(Transform3D):
 
     def inverse(self) -> AffineTransform3D:
         """Return the inverse of an affine transformation."""
-        linear_inv = LinearTransform3D(self.inner[:3, :3]).inverse()
-        # first undo translation, then undo linear transformation
-        return linear_inv @ AffineTransform3D.translate(*-self.translation())
+        # block inverse: [A t]^-1   [A^-1 -A^-1 t]
+        #                [0 1]    = [ 0      1   ]
+        linear_inv = _inv3x3(self.inner[:3, :3])
+        a = numpy.zeros((4, 4), dtype=linear_inv.dtype)
+        a[:3, :3] = linear_inv
+        a[:3, 3] = -(linear_inv @ self.inner[:3, 3])
+        a[3, 3] = 1.
+        return AffineTransform3D._from_validated(a)
 
     @t.overload
     @classmethod
@@ -218,7 +420,7 @@ class AffineTransform3D(Transform3D):
 
         Can be called as a classmethod or instance method.
         """
-        if isinstance(x, t.Sized) and len(x) > 1:
+        if _is_seq(x) and len(x) > 1:
             try:
                 (x, y, z) = to_vec3(x)
             except ValueError:
@@ -228,8 +430,8 @@ class AffineTransform3D(Transform3D):
             self = AffineTransform3D.from_linear(self)
 
         a = self.inner.copy()
-        a[:3, -1] += [x, y, z]
-        return AffineTransform3D(a)
+        a[:3, -1] += numpy.array([x, y, z], dtype=a.dtype)
+        return AffineTransform3D._from_validated(a)
 
     @t.overload
     @classmethod
@@ -336,6 +538,48 @@ class AffineTransform3D(Transform3D):
         # q is orthogonal, so q^-1 = q.T
         return LinearTransform3D(r).translate(q.T @ translation).round_near_zero()
 
+    @cached_property
+    def _linear_t(self) -> NDArray[numpy.floating]:
+        """C-contiguous transpose of the linear part of `self`, for use in `_transform_pts`."""
+        linear_t = numpy.ascontiguousarray(self.inner[:3, :3].T)
+        linear_t.flags.writeable = False
+        return linear_t
+
+    @cached_property
+    def _rows(self) -> t.List[t.List[float]]:
+        """Rows `[a, b, c, translation]` of `self` as Python floats, for transforming single points."""
+        return [row + [trans] for (row, trans) in zip(self._linear_t.T.tolist(), self.translation().tolist())]
+
+    def _transform_single(self, point: NDArray[numpy.generic]) -> t.Optional[NDArray[numpy.floating]]:
+        """
+        Transform the single point `point` (shape `(3,)`), using unrolled scalar arithmetic
+        (much cheaper than numpy dispatch).
+
+        Returns `None` if the output contains nans, which require careful handling (see `_transform_pts`).
+        """
+        (x, y, z) = point.tolist()
+        out = [r[0]*x + r[1]*y + r[2]*z + r[3] for r in self._rows]
+        if any(map(math.isnan, out)):
+            return None
+        return numpy.array(out, dtype=self.inner.dtype)
+
+    def _transform_bbox(self, bbox: BBox3D) -> BBox3D:
+        # interval arithmetic, rather than transforming all 8 corners:
+        # each output bound is the sum of the extreme contributions along each input axis
+        linear = self.inner[:3, :3]
+        with numpy.errstate(invalid='ignore'):
+            lo = linear * bbox.min
+            hi = linear * bbox.max
+        # inf * 0 = 0
+        lo[numpy.isnan(lo)] = 0.
+        hi[numpy.isnan(hi)] = 0.
+
+        translation = self.translation()
+        return type(bbox)(
+            numpy.minimum(lo, hi).sum(axis=-1) + translation,
+            numpy.maximum(lo, hi).sum(axis=-1) + translation,
+        )
+
     @t.overload
     def transform(self, points: BBox3D) -> BBox3D:
         ...
@@ -347,27 +591,55 @@ class AffineTransform3D(Transform3D):
     def transform(self, points: Pts3DLike) -> t.Union[BBox3D, NDArray[numpy.floating]]:
         """Transform points according to the given transformation."""
         if isinstance(points, BBox3D):
-            return points.from_pts(self.transform(points.corners()))
+            return self._transform_bbox(points)
+        if isinstance(points, numpy.ndarray) and points.shape == (3,):
+            if (out := self._transform_single(points)) is not None:
+                return out
 
-        pts: NDArray[numpy.floating] = numpy.atleast_1d(points).astype(self.inner.dtype)
-        pts = numpy.concatenate((points, numpy.broadcast_to(1., (*pts.shape[:-1], 1))), axis=-1)
+        pts: NDArray[numpy.floating] = numpy.atleast_1d(points).astype(self.inner.dtype, copy=False)
+        if pts.shape[-1] != 3:
+            raise ValueError(f"{self.__class__} works on 3d points only.")
 
-        # carefully handle inf and nan
-        isnan = numpy.bitwise_or.reduce(numpy.isnan(pts), axis=-1)
+        # split into linear and translation parts, rather than
+        # materializing homogeneous coordinates
+        return _transform_pts(pts, self._linear_t, self.inner[:3, 3])
 
-        with numpy.errstate(invalid='ignore'):
-            out = pts @ self.inner.T
-            isinf = numpy.isnan(out[..., 0]) & ~isnan
+    __call__ = transform
 
-            prod = numpy.multiply(self.inner, pts[isinf, None, :])
+    def transform_soa(self, points: ArrayLike) -> NDArray[numpy.floating]:
+        """
+        Transform points stored in structure-of-arrays layout (shape `(3, N)`, i.e. `[[x...], [y...], [z...]]`),
+        returning points in the same layout.
 
-        # inf * 0 = 0
-        prod[numpy.isnan(prod)] = 0.
-        out[isinf] = numpy.sum(prod, axis=-1)
+        This avoids transposing to and from `(N, 3)`. Unlike [`transform`][atomlib.transform.AffineTransform3D.transform],
+        no special handling is performed for infinite coordinates.
+        """
+        pts = _soa_pts(points, self.inner.dtype)
+        out = self.inner[:3, :3] @ pts
+        out += self.inner[:3, 3:]
+        return out
 
-        return out[..., :3]
+    def transform_cuda(self, points: t.Any) -> t.Any:
+        """
+        Transform points (shape `(..., 3)`) on the GPU, using the optional dependency [CuPy](https://cupy.dev).
 
-    __call__ = transform
+        `points` may be a host array or a CuPy device array. The result is returned as a device array,
+        so pipelines which keep points on the device avoid copies (call `.get()` to copy to the host).
+        Unlike [`transform`][atomlib.transform.AffineTransform3D.transform],
+        no special handling is performed for infinite coordinates.
+
+        This is opt-in: [`transform`][atomlib.transform.AffineTransform3D.transform] never dispatches
+        to the GPU automatically, as it must return host arrays and the transfer cost
+        depends on where the caller's points live.
+        """
+        import cupy  # type: ignore
+
+        pts = cupy.asarray(points, dtype=self.inner.dtype)
+        if pts.shape[-1] != 3:
+            raise ValueError(f"{self.__class__} works on 3d points only.")
+        out = pts @ cupy.asarray(self._linear_t)
+        out += cupy.asarray(self.translation())
+        return out
 
     def transform_vec(self, vecs: ArrayLike) -> NDArray[numpy.floating]:
         return self.to_linear().transform(vecs)
@@ -381,13 +653,23 @@ class AffineTransform3D(Transform3D):
         ...
 
     def compose(self, other: Transform3D) -> Transform3D:
-        """Compose this transformation with another."""
+        """
+        Compose this transformation with another.
+
+        Affine results keep the dtype of `self` (the transformation applied first).
+        """
         if not isinstance(other, Transform3D):
             raise TypeError(f"Expected a Transform3D, got {type(other)}")
         if isinstance(other, LinearTransform3D):
-            return self.compose(AffineTransform3D.from_linear(other))
+            # specialized for the block structure, rather than promoting `other` to 4x4.
+            # [L 0] [A t]   [L@A L@t]
+            # [0 1] [0 1] = [ 0   1 ]
+            a = self.inner.copy()
+            a[:3] = other.inner @ self.inner[:3]
+            return AffineTransform3D._from_validated(a)
         if isinstance(other, AffineTransform3D):
-            return AffineTransform3D(other.inner @ self.inner)
+            a = (other.inner @ self.inner).astype(self.inner.dtype, copy=False)
+            return AffineTransform3D._from_validated(a)
         elif hasattr(other, '_rcompose'):
             return other._rcompose(self)  # type: ignore
         else:
@@ -433,14 +715,22 @@ class AffineTransform3D(Transform3D):
 
 
 class LinearTransform3D(AffineTransform3D):
-    def __init__(self, array: t.Optional[ArrayLike] = None):
+    def __init__(self, array: t.Optional[ArrayLike] = None, dtype: t.Optional[DTypeLike] = None):
+        """
+        Create a linear transformation from a 3x3 matrix (default: identity).
+
+        `dtype` sets the floating point type of the matrix (e.g. `numpy.float32`, to halve
+        the memory traffic of `transform`). Transformations built from `self` keep its dtype,
+        and points are transformed at this precision.
+        """
         if array is None:
-            array = numpy.eye(3, dtype=numpy.float64)
-        self.inner = numpy.broadcast_to(array, (3, 3))
+            self.inner = _IDENTITY3 if dtype is None else _to_matrix(_IDENTITY3, 3, dtype)
+        else:
+            self.inner = _to_matrix(array, 3, dtype)
 
-    @property
-    def T(self):
-        return LinearTransform3D(self.inner.T)
+    @cached_property
+    def T(self) -> LinearTransform3D:
+        return LinearTransform3D._from_validated(self._linear_t.copy())
 
     def __repr__(self) -> str:
         return f"LinearTransform3D(\n{self.inner!r}\n)"
@@ -460,7 +750,7 @@ class LinearTransform3D(AffineTransform3D):
 
     def inverse(self) -> LinearTransform3D:
         """Return the inverse of an affine transformation."""
-        return LinearTransform3D(numpy.linalg.inv(self.inner))
+        return LinearTransform3D._from_validated(_inv3x3(self.inner))
 
     def to_linear(self) -> LinearTransform3D:
         """Return the linear part of an affine transformation."""
@@ -514,15 +804,15 @@ class LinearTransform3D(AffineTransform3D):
 
         Can be called as a classmethod or instance method.
         """
-        if isinstance(a, t.Sized):
+        if _is_seq(a):
             v = numpy.array(numpy.broadcast_to(a, 3), dtype=numpy.float64)
             if b is not None or c is not None:
                 raise ValueError("mirror() must be passed a sequence or three numbers.")
         else:
             v = numpy.array([a, b, c], dtype=numpy.float64)
         v /= numpy.linalg.norm(v)
-        mirror = numpy.eye(3) - 2 * numpy.outer(v, v)
-        return LinearTransform3D(mirror @ self.inner)
+        mirror = (numpy.eye(3) - 2 * numpy.outer(v, v)).astype(self.inner.dtype, copy=False)
+        return LinearTransform3D._from_validated(mirror @ self.inner)
 
     @opt_classmethod
     def strain(self, strain: float, v: VecLike = (0, 0, 1), poisson: float = 0.) -> LinearTransform3D:
@@ -540,7 +830,7 @@ class LinearTransform3D(AffineTransform3D):
         """
         shrink = (1 + strain) ** -poisson
         return self.compose(LinearTransform3D.align(v).conjugate(
-                            LinearTransform3D.scale([shrink, shrink, 1. + strain])))
+                            LinearTransform3D.scale([shrink, shrink, 1. + strain])).astype(self.inner.dtype))
 
     @opt_classmethod
     def rotate(self, v: VecLike, theta: Num) -> LinearTransform3D:
@@ -552,21 +842,25 @@ class LinearTransform3D(AffineTransform3D):
         """
         theta = float(theta)
         v = numpy.array(numpy.broadcast_to(v, (3,)), dtype=numpy.float64)
-        l = numpy.linalg.norm(v)
-        if numpy.isclose(l, 0.):
-            if numpy.isclose(theta, 0.):
+        l = math.sqrt(v @ v)
+        # equivalent to numpy.isclose(l, 0.), without the overhead
+        if l <= 1e-8:
+            if abs(theta) <= 1e-8:
                 # null rotation
                 return self
             raise ValueError("rotate() about the zero vector is undefined.")
-        v /= l
+        (x, y, z) = (v / l).tolist()
 
-        # Rodrigues rotation formula
-        w = numpy.array([[  0., -v[2],  v[1]],
-                         [ v[2],   0., -v[0]],
-                         [-v[1], v[0],   0.]], dtype=numpy.float64)
+        # Rodrigues rotation formula, expanded elementwise:
         # I + sin(t) W + (1 - cos(t)) W^2 = I + sin(t) W + 2*sin^2(t/2) W^2
-        a = numpy.eye(3) + numpy.sin(theta) * w + 2 * (numpy.sin(theta / 2)**2) * w @ w
-        return LinearTransform3D(a @ self.inner)
+        s = math.sin(theta)
+        c1 = 2. * math.sin(theta / 2.)**2
+        a = numpy.array([
+            [1. - c1*(y*y + z*z), c1*x*y - s*z,        c1*x*z + s*y       ],
+            [c1*x*y + s*z,        1. - c1*(x*x + z*z), c1*y*z - s*x       ],
+            [c1*x*z - s*y,        c1*y*z + s*x,        1. - c1*(x*x + y*y)],
+        ], dtype=self.inner.dtype)
+        return LinearTransform3D._from_validated(a @ self.inner)
 
     @opt_classmethod
     def rotate_euler(self, x: Num = 0., y: Num = 0., z: Num = 0.) -> LinearTransform3D:
@@ -577,14 +871,16 @@ class LinearTransform3D(AffineTransform3D):
 
         Can be called as a classmethod or instance method.
         """
-        angles = numpy.array([x, y, z], dtype=numpy.float64)
-        c, s = numpy.cos(angles), numpy.sin(angles)
+        # scalar trig is much cheaper than building and indexing small arrays
+        (x, y, z) = (float(x), float(y), float(z))
+        (c0, c1, c2) = (math.cos(x), math.cos(y), math.cos(z))
+        (s0, s1, s2) = (math.sin(x), math.sin(y), math.sin(z))
         a = numpy.array([
-            [c[1]*c[2], s[0]*s[1]*c[2] - c[0]*s[2], c[0]*s[1]*c[2] + s[0]*s[2]],
-            [c[1]*s[2], s[0]*s[1]*s[2] + c[0]*c[2], c[0]*s[1]*s[2] - s[0]*c[2]],
-            [-s[1],     s[0]*c[1],                  c[0]*c[1]],
-        ], dtype=numpy.float64)
-        return LinearTransform3D(a @ self.inner)
+            [c1*c2, s0*s1*c2 - c0*s2, c0*s1*c2 + s0*s2],
+            [c1*s2, s0*s1*s2 + c0*c2, c0*s1*s2 - s0*c2],
+            [-s1,   s0*c1,            c0*c1],
+        ], dtype=self.inner.dtype)
+        return LinearTransform3D._from_validated(a @ self.inner)
 
     @opt_classmethod
     def align(self, v1: VecLike, horz: t.Optional[VecLike] = None) -> LinearTransform3D:
@@ -712,16 +1008,16 @@ class LinearTransform3D(AffineTransform3D):
 
         Can be called as a classmethod or instance method.
         """
-        if isinstance(x, t.Sized):
+        if _is_seq(x):
             v = numpy.broadcast_to(x, 3)
             if y != 1. or z != 1.:
                 raise ValueError("scale() must be passed a sequence or three numbers.")
         else:
             v = numpy.array([x, y, z])
 
-        a = numpy.zeros((3, 3), dtype=self.inner.dtype)
-        a[numpy.diag_indices(3)] = all * v
-        return LinearTransform3D(a @ self.inner)
+        # diag(v) @ inner is just a scaling of the rows of inner
+        v = numpy.asarray(all * v, dtype=self.inner.dtype)
+        return LinearTransform3D._from_validated(self.inner * v[:, None])
 
     def conjugate(self, transform: Transform3DT) -> Transform3DT:  # type: ignore (spurious)
         """
@@ -732,11 +1028,21 @@ class LinearTransform3D(AffineTransform3D):
         return self.inverse() @ self.compose(transform)
 
     def compose(self, other: Transform3DT) -> Transform3DT:
-        """Compose this transformation with another."""
+        """
+        Compose this transformation with another.
+
+        Affine results keep the dtype of `self` (the transformation applied first).
+        """
         if isinstance(other, LinearTransform3D):
-            return other.__class__(other.inner @ self.inner)
+            a = (other.inner @ self.inner).astype(self.inner.dtype, copy=False)
+            return other.__class__._from_validated(a)
         if isinstance(other, AffineTransform3D):
-            return AffineTransform3D.from_linear(self).compose(other)
+            # specialized for the block structure, rather than promoting `self` to 4x4.
+            # [A t] [L 0]   [A@L t]
+            # [0 1] [0 1] = [ 0  1]
+            a = other.inner.astype(self.inner.dtype)
+            a[:3, :3] = other.inner[:3, :3] @ self.inner
+            return t.cast(Transform3DT, AffineTransform3D._from_validated(a))
         if not isinstance(other, Transform3D):
             raise TypeError(f"Expected a Transform3D, got {type(other)}")
         elif hasattr(other, '_rcompose'):
@@ -754,26 +1060,26 @@ class LinearTransform3D(AffineTransform3D):
     def transform(self, points: Pts3DLike) -> t.Union[BBox3D, NDArray[numpy.floating]]:
         """Transform points according to the given transformation."""
         if isinstance(points, BBox3D):
-            return points.from_pts(self.transform(points.corners()))
+            return self._transform_bbox(points)
+        if isinstance(points, numpy.ndarray) and points.shape == (3,):
+            if (out := self._transform_single(points)) is not None:
+                return out
 
-        pts: NDArray[numpy.floating] = numpy.atleast_1d(points).astype(self.inner.dtype)
+        pts: NDArray[numpy.floating] = numpy.atleast_1d(points).astype(self.inner.dtype, copy=False)
         if pts.shape[-1] != 3:
             raise ValueError(f"{self.__class__} works on 3d points only.")
 
-        # carefully handle inf and nan
-        isnan = numpy.bitwise_or.reduce(numpy.isnan(pts), axis=-1)
-
-        with numpy.errstate(invalid='ignore'):
-            out = pts @ self.inner.T
-            isinf = numpy.isnan(out[..., 0]) & ~isnan
-
-            prod = numpy.multiply(self.inner, pts[isinf, None, :])
+        return _transform_pts(pts, self._linear_t)
 
-        # inf * 0 = 0
-        prod[numpy.isnan(prod)] = 0.
-        out[isinf] = numpy.sum(prod, axis=-1)
+    def transform_soa(self, points: ArrayLike) -> NDArray[numpy.floating]:
+        """
+        Transform points stored in structure-of-arrays layout (shape `(3, N)`, i.e. `[[x...], [y...], [z...]]`),
+        returning points in the same layout.
 
-        return out
+        This avoids transposing to and from `(N, 3)`. Unlike [`transform`][atomlib.transform.LinearTransform3D.transform],
+        no special handling is performed for infinite coordinates.
+        """
+        return self.inner @ _soa_pts(points, self.inner.dtype)
 
     @t.overload
     def __matmul__(self, other: Transform3DT) -> Transform3DT:
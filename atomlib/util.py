@@ -4,6 +4,7 @@ from pathlib import Path
 from contextlib import nullcontext, AbstractContextManager
 from hashlib import sha256
 import datetime
+from types import MethodType
 import json
 import time
 import typing as t
@@ -120,10 +121,8 @@ class opt_classmethod(classmethod, t.Generic[T, P, U_co]):
             if ty is None:
                 raise RuntimeError()  # pragma: no cover
             obj = ty()
-        return t.cast(
-            t.Callable[P, U_co],
-            super().__get__(obj, obj)  # type: ignore
-        )
+        # bind directly, rather than going through classmethod.__get__
+        return t.cast(t.Callable[P, U_co], MethodType(self.__func__, obj))
 
 
 def proc_seed(seed: t.Optional[object], entropy: object) -> t.Optional[NDArray[numpy.uint32]]: